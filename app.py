@@ -1,15 +1,17 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
-import tempfile
-import os
-from utils.audio_processor import AudioProcessor
+import queue
+import hashlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from utils.sentiment_analyzer import SentimentAnalyzer
 from utils.wellness_generator import WellnessGenerator
+from config import MAX_HISTORY_ENTRIES, DATA_RETENTION_DAYS, STRESS_LEVELS, ENERGY_LEVELS
+from config import MAX_ANALYSIS_WORKERS
 import json
+import re
 
 # Audio recording is optional - we'll use text input as primary method
 AUDIO_RECORDER_AVAILABLE = False
@@ -22,27 +24,189 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+MOOD_COLUMNS = ['timestamp', 'transcript', 'mood_score', 'stress_level', 'energy_level']
+# Categories are fixed up front so concatenating new rows never rebuilds them
+MOOD_DTYPES = {
+    'timestamp': 'datetime64[s]',
+    'mood_score': 'uint8',
+    'stress_level': pd.CategoricalDtype(STRESS_LEVELS),
+    'energy_level': pd.CategoricalDtype(ENERGY_LEVELS)
+}
+
+def new_mood_df(rows=()):
+    return pd.DataFrame(list(rows), columns=MOOD_COLUMNS).astype(MOOD_DTYPES)
+
 # Initialize session state
-if 'mood_history' not in st.session_state:
-    st.session_state.mood_history = []
+if 'mood_df' not in st.session_state:
+    st.session_state.mood_df = new_mood_df()
+# Kept out of mood_df so its columns stay flat; one dict per mood_df row
+if 'suggestion_history' not in st.session_state:
+    st.session_state.suggestion_history = []
 if 'stress_triggers' not in st.session_state:
-    st.session_state.stress_triggers = {}
+    st.session_state.stress_triggers = Counter()
 if 'wellness_log' not in st.session_state:
     st.session_state.wellness_log = []
+# Export records serialized once at save time, one NDJSON line per mood_df row / wellness_log entry
+if 'checkin_lines' not in st.session_state:
+    st.session_state.checkin_lines = []
+if 'journal_lines' not in st.session_state:
+    st.session_state.journal_lines = []
+
+def ndjson_line(record):
+    return json.dumps(record, separators=(',', ':')) + "\n"
+
+SAMPLE_PROMPTS = [
+    "I'm feeling productive today but worried about tomorrow's presentation.",
+    "Overwhelmed with emails and back-to-back meetings. Need a break.",
+    "Great morning! Accomplished a lot and feeling motivated.",
+    "Tired from staying up late. Struggling to focus on important tasks."
+]
+
+# Runs analyses off the session's script thread so tokens can be relayed while the call is in flight.
+# Shared by every session in the process; a check-in only queues once MAX_ANALYSIS_WORKERS are busy.
+@st.cache_resource
+def get_executor():
+    return ThreadPoolExecutor(max_workers=MAX_ANALYSIS_WORKERS)
+
+def digest_key(text):
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+class UncachedResult(Exception):
+    def __init__(self, result):
+        super().__init__("analysis fell back to keywords")
+        self.result = result
+
+# Keyed on digests only; underscore args are skipped by Streamlit's hasher
+@st.cache_data(ttl=3600, max_entries=512)
+def _cached_sentiment(transcript_hash, _transcript, _sentiment_analyzer, _on_token=None):
+    result = _sentiment_analyzer.analyze_sentiment(_transcript, on_token=_on_token)
+    if result.get('fallback'):
+        # st.cache_data doesn't store raised calls, so the next attempt retries the API
+        raise UncachedResult(result)
+    return result
+
+@st.cache_data(ttl=3600, max_entries=512)
+def _cached_wellness(transcript_hash, sentiment_hash, _transcript, _sentiment_result, _wellness_generator):
+    return _wellness_generator.generate_suggestions(_transcript, _sentiment_result)
+
+def cached_sentiment(transcript, sentiment_analyzer, on_token=None):
+    try:
+        return _cached_sentiment(digest_key(transcript), transcript, sentiment_analyzer, on_token)
+    except UncachedResult as e:
+        return e.result
+
+def cached_wellness(transcript, sentiment_result, wellness_generator):
+    sentiment_hash = digest_key(json.dumps(sentiment_result, sort_keys=True, default=str))
+    return _cached_wellness(digest_key(transcript), sentiment_hash, transcript,
+                            sentiment_result, wellness_generator)
+
+# Good/low mood threshold lines, applied in one layout update instead of two add_hline calls
+MOOD_THRESHOLD_LAYOUT = {
+    'shapes': [
+        dict(type='line', xref='paper', x0=0, x1=1, y0=7, y1=7, line=dict(dash='dash', color='green')),
+        dict(type='line', xref='paper', x0=0, x1=1, y0=4, y1=4, line=dict(dash='dash', color='red'))
+    ],
+    'annotations': [
+        dict(xref='paper', x=1, y=7, text="Good Mood Threshold", showarrow=False,
+             xanchor='right', yanchor='bottom'),
+        dict(xref='paper', x=1, y=4, text="Low Mood Alert", showarrow=False,
+             xanchor='right', yanchor='bottom')
+    ]
+}
+
+# Figures are rebuilt only when the plotted data changes; args are plain tuples so they hash cheaply
+@st.cache_data(max_entries=32)
+def _mood_trend_fig(records, show_thresholds=False, height=None):
+    import plotly.express as px
+    
+    df = pd.DataFrame(records, columns=['timestamp', 'mood_score'])
+    fig = px.line(df, x='timestamp', y='mood_score',
+                  title="Mood Score Trend", range_y=[0, 10])
+    if show_thresholds:
+        fig.update_layout(**MOOD_THRESHOLD_LAYOUT)
+    if height:
+        fig.update_layout(height=height)
+    return fig
+
+@st.cache_data(max_entries=32)
+def _distribution_fig(counts, title):
+    import plotly.express as px
+    
+    names, values = zip(*counts)
+    return px.pie(values=values, names=names, title=title)
+
+@st.cache_data(max_entries=32)
+def _triggers_fig(top_triggers):
+    import plotly.express as px
+    
+    triggers_df = pd.DataFrame(top_triggers, columns=['Trigger', 'Frequency'])
+    return px.bar(triggers_df, x='Frequency', y='Trigger', 
+                  orientation='h', title="Most Common Stress Triggers")
+
+def mood_records(df):
+    return tuple(df[['timestamp', 'mood_score']].itertuples(index=False, name=None))
+
+# Relay tokens from a worker thread to st.write_stream; yields nothing on a cache hit
+def stream_until_done(future, tokens):
+    while not (future.done() and tokens.empty()):
+        try:
+            yield tokens.get(timeout=0.05)
+        except queue.Empty:
+            pass
+
+# Fields shown while the model's JSON streams in, each once its value is complete
+PROGRESS_FIELDS = [
+    ("Mood score", re.compile(r'"mood_score"\s*:\s*(\d+)\s*[,}\n]'), "{}/10"),
+    ("Stress level", re.compile(r'"stress_level"\s*:\s*"([^"]*)"'), "{}"),
+    ("Energy level", re.compile(r'"energy_level"\s*:\s*"([^"]*)"'), "{}"),
+    ("Emotions", re.compile(r'"emotional_indicators"\s*:\s*(\[[^\]]*\])'), "{}"),
+    ("Stress triggers", re.compile(r'"stress_triggers"\s*:\s*(\[[^\]]*\])'), "{}")
+]
+
+def readable_progress(tokens):
+    text = ""
+    shown = set()
+    for token in tokens:
+        text += token
+        for label, pattern, template in PROGRESS_FIELDS:
+            match = pattern.search(text) if label not in shown else None
+            if match:
+                shown.add(label)
+                value = match.group(1)
+                if value.startswith("["):
+                    try:
+                        value = ", ".join(json.loads(value)) or "none"
+                    except (ValueError, TypeError):
+                        pass
+                yield f"- **{label}**: {template.format(value)}\n"
+
+def analyze_samples(sentiment_analyzer, wellness_generator):
+    sentiment_results = sentiment_analyzer.analyze_batch(SAMPLE_PROMPTS)
+    return {
+        prompt: (sentiment_result, wellness_generator.generate_suggestions(prompt, sentiment_result))
+        for prompt, sentiment_result in zip(SAMPLE_PROMPTS, sentiment_results)
+    }
 
 # Initialize processors
 @st.cache_resource
 def load_processors():
-    audio_processor = AudioProcessor()
+    audio_processor = None
+    if AUDIO_RECORDER_AVAILABLE:
+        from utils.audio_processor import AudioProcessor
+        audio_processor = AudioProcessor()
     sentiment_analyzer = SentimentAnalyzer()
     wellness_generator = WellnessGenerator()
-    return audio_processor, sentiment_analyzer, wellness_generator
+    
+    # Analyze the fixed sample prompts in one background request so clicking one is instant
+    sample_cache = get_executor().submit(analyze_samples, sentiment_analyzer, wellness_generator)
+    
+    return audio_processor, sentiment_analyzer, wellness_generator, sample_cache
 
 def main():
     st.title("🧘 SereneDesk: AI Workspace Mood Optimizer")
     st.markdown("*Transform your workspace into a sanctuary of productivity and wellness*")
     
-    audio_processor, sentiment_analyzer, wellness_generator = load_processors()
+    audio_processor, sentiment_analyzer, wellness_generator, sample_cache = load_processors()
     
     # Sidebar for navigation
     with st.sidebar:
@@ -57,14 +221,16 @@ def main():
         
         st.markdown("---")
         st.markdown("### Quick Stats")
-        if st.session_state.mood_history:
-            avg_mood = np.mean([entry['mood_score'] for entry in st.session_state.mood_history])
+        mood_df = st.session_state.mood_df
+        if not mood_df.empty:
+            avg_mood = mood_df['mood_score'].mean()
             st.metric("Average Mood", f"{avg_mood:.1f}/10")
-            st.metric("Check-ins Today", len([e for e in st.session_state.mood_history 
-                                            if e['timestamp'].date() == datetime.now().date()]))
+            today = np.datetime64(datetime.now().date())
+            today_count = (mood_df['timestamp'].values.astype('datetime64[D]') == today).sum()
+            st.metric("Check-ins Today", int(today_count))
     
     if page == "💭 Mood Check-in":
-        voice_checkin_page(audio_processor, sentiment_analyzer, wellness_generator)
+        voice_checkin_page(audio_processor, sentiment_analyzer, wellness_generator, sample_cache)
     elif page == "📊 Mood Analytics":
         analytics_page()
     elif page == "🎵 Ambient Soundscapes":
@@ -74,7 +240,7 @@ def main():
     elif page == "⚙️ Settings":
         settings_page()
 
-def voice_checkin_page(audio_processor, sentiment_analyzer, wellness_generator):
+def voice_checkin_page(audio_processor, sentiment_analyzer, wellness_generator, sample_cache):
     st.header("💭 Mood Check-in")
     st.markdown("Share how you're feeling and get personalized wellness recommendations")
     
@@ -114,57 +280,71 @@ def voice_checkin_page(audio_processor, sentiment_analyzer, wellness_generator):
             st.subheader("Your Check-in")
             st.write(transcript)
             
-            with st.spinner("Analyzing your check-in..."):
-                try:
-                    # Analyze sentiment
-                    sentiment_result = sentiment_analyzer.analyze_sentiment(transcript)
-                    
-                    # Generate wellness recommendations
-                    wellness_suggestions = wellness_generator.generate_suggestions(
-                        transcript, sentiment_result
-                    )
-                    
-                    # Display results
-                    display_analysis_results(sentiment_result, wellness_suggestions)
-                    
-                    # Save to history
-                    save_checkin(transcript, sentiment_result, wellness_suggestions)
-                    
-                except Exception as e:
-                    st.error(f"Sorry, there was an issue analyzing your check-in: {e}")
-                    st.info("Please make sure you have set up your OpenAI API key in the .env file.")
+            try:
+                # Analyze sentiment off the script thread, streaming tokens as they arrive
+                tokens = queue.Queue()
+                future = get_executor().submit(cached_sentiment, transcript, sentiment_analyzer, tokens.put)
+                with st.status("Analyzing your check-in...", expanded=True) as status:
+                    st.empty().write_stream(readable_progress(stream_until_done(future, tokens)))
+                    sentiment_result = future.result()
+                    status.update(label="Analysis complete", state="complete", expanded=False)
+                
+                # Generate wellness recommendations
+                wellness_suggestions = cached_wellness(transcript, sentiment_result, wellness_generator)
+                
+                # Display results
+                display_analysis_results(sentiment_result, wellness_suggestions)
+                
+                # Save to history
+                save_checkin(transcript, sentiment_result, wellness_suggestions)
+                
+            except Exception as e:
+                st.error(f"Sorry, there was an issue analyzing your check-in: {e}")
+                st.info("Please make sure you have set up your OpenAI API key in the .env file.")
         
         elif st.button("✨ Get Wellness Insights", type="primary", key="insights_button_empty"):
             st.warning("Please share how you're feeling before getting insights!")
+        
+        # Sample prompts were analyzed at startup; preview the result without saving it as the user's check-in
+        sample_text = st.session_state.pop('sample_text', None)
+        if sample_text:
+            st.subheader("Example Check-in")
+            st.write(sample_text)
+            
+            try:
+                with st.spinner("Analyzing your check-in..."):
+                    sentiment_result, wellness_suggestions = sample_cache.result()[sample_text]
+                    if sentiment_result.get('fallback'):
+                        # The startup analysis degraded and lives for the whole process; retry it
+                        sentiment_result = cached_sentiment(sample_text, sentiment_analyzer)
+                        wellness_suggestions = cached_wellness(sample_text, sentiment_result, wellness_generator)
+                st.caption("This is an example and isn't saved to your history.")
+                display_analysis_results(sentiment_result, wellness_suggestions)
+            
+            except Exception as e:
+                st.error(f"Sorry, there was an issue analyzing this example: {e}")
+                st.info("Please make sure you have set up your OpenAI API key in the .env file.")
     
     with col2:
         st.subheader("Recent Mood Trend")
-        if st.session_state.mood_history:
-            recent_moods = st.session_state.mood_history[-7:]  # Last 7 entries
-            df = pd.DataFrame(recent_moods)
-            fig = px.line(df, x='timestamp', y='mood_score', 
-                         title="Mood Score Trend",
-                         range_y=[0, 10])
-            fig.update_layout(height=300)
+        if not st.session_state.mood_df.empty:
+            df = st.session_state.mood_df.tail(7)  # Last 7 entries
+            fig = _mood_trend_fig(mood_records(df), height=300)
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("Start with check-ins to see your mood trend!")
             
         # Sample prompts to help users
         st.subheader("Need inspiration?")
-        sample_prompts = [
-            "I'm feeling productive today but worried about tomorrow's presentation.",
-            "Overwhelmed with emails and back-to-back meetings. Need a break.",
-            "Great morning! Accomplished a lot and feeling motivated.",
-            "Tired from staying up late. Struggling to focus on important tasks."
-        ]
-        
-        for i, prompt in enumerate(sample_prompts):
+        for i, prompt in enumerate(SAMPLE_PROMPTS):
             if st.button(f"Use this example", key=f"sample_{i}", help=prompt):
                 st.session_state.sample_text = prompt
+                st.rerun()
 
 def display_analysis_results(sentiment_result, wellness_suggestions):
     st.subheader("Analysis Results")
+    if sentiment_result.get('fallback'):
+        st.warning("The AI analysis is unavailable right now, so this is a keyword-based estimate. Try again shortly.")
     
     col1, col2, col3 = st.columns(3)
     
@@ -194,45 +374,69 @@ def display_analysis_results(sentiment_result, wellness_suggestions):
         st.write(wellness_suggestions['journaling_prompt'])
 
 def save_checkin(transcript, sentiment_result, wellness_suggestions):
+    stress_level = sentiment_result.get('stress_level', 'Moderate')
+    energy_level = sentiment_result.get('energy_level', 'Medium')
     entry = {
         'timestamp': datetime.now(),
         'transcript': transcript,
-        'mood_score': sentiment_result.get('mood_score', 5),
-        'stress_level': sentiment_result.get('stress_level', 'Moderate'),
-        'energy_level': sentiment_result.get('energy_level', 'Medium'),
-        'wellness_suggestions': wellness_suggestions
+        'mood_score': np.uint8(min(max(round(float(sentiment_result.get('mood_score', 5))), 0), 10)),
+        'stress_level': stress_level if stress_level in STRESS_LEVELS else 'Moderate',
+        'energy_level': energy_level if energy_level in ENERGY_LEVELS else 'Medium'
     }
-    st.session_state.mood_history.append(entry)
+    new_row = new_mood_df([entry])
+    if st.session_state.mood_df.empty:
+        st.session_state.mood_df = new_row
+    else:
+        st.session_state.mood_df = pd.concat([st.session_state.mood_df, new_row], ignore_index=True)
+    st.session_state.suggestion_history.append(wellness_suggestions)
+    st.session_state.checkin_lines.append(ndjson_line({
+        **entry,
+        'type': 'checkin',
+        'timestamp': entry['timestamp'].isoformat(),
+        'mood_score': int(entry['mood_score']),
+        'stress_triggers': sentiment_result.get('stress_triggers', []),
+        'wellness_suggestions': wellness_suggestions
+    }))
+    prune_history()
     
     # Update stress triggers
-    triggers = sentiment_result.get('stress_triggers', [])
-    for trigger in triggers:
-        if trigger in st.session_state.stress_triggers:
-            st.session_state.stress_triggers[trigger] += 1
-        else:
-            st.session_state.stress_triggers[trigger] = 1
+    st.session_state.stress_triggers.update(sentiment_result.get('stress_triggers', []))
+
+def prune_history():
+    # Drop check-ins past the retention window, then cap the total count
+    df = st.session_state.mood_df
+    cutoff = datetime.now() - timedelta(days=DATA_RETENTION_DAYS)
+    start = max(df['timestamp'].values.searchsorted(np.datetime64(cutoff)),
+                len(df) - MAX_HISTORY_ENTRIES)
+    if start > 0:
+        st.session_state.mood_df = df.iloc[start:].reset_index(drop=True)
+        del st.session_state.suggestion_history[:start]
+        del st.session_state.checkin_lines[:start]
 
 def analytics_page():
     st.header("📊 Mood Analytics Dashboard")
     
-    if not st.session_state.mood_history:
+    if st.session_state.mood_df.empty:
         st.info("Start recording voice check-ins to see your analytics!")
         return
     
-    df = pd.DataFrame(st.session_state.mood_history)
-    
+    _analytics_body(st.session_state.mood_df)
+
+# Runs as a fragment so changing the period reruns only the dashboard, not the whole script
+@st.fragment
+def _analytics_body(df):
     # Time period selector
     col1, col2 = st.columns([3, 1])
     with col2:
         period = st.selectbox("Time Period", ["Last 7 days", "Last 30 days", "All time"])
     
-    # Filter data based on period
+    # Filter data based on period (check-ins are appended in time order)
     if period == "Last 7 days":
         cutoff = datetime.now() - timedelta(days=7)
-        df_filtered = df[df['timestamp'] >= cutoff]
+        df_filtered = df.iloc[df['timestamp'].values.searchsorted(np.datetime64(cutoff)):]
     elif period == "Last 30 days":
         cutoff = datetime.now() - timedelta(days=30)
-        df_filtered = df[df['timestamp'] >= cutoff]
+        df_filtered = df.iloc[df['timestamp'].values.searchsorted(np.datetime64(cutoff)):]
     else:
         df_filtered = df
     
@@ -240,6 +444,10 @@ def analytics_page():
         st.warning(f"No data available for {period.lower()}")
         return
     
+    # Levels are categoricals, so their integer codes can be counted directly
+    stress_counts = np.bincount(df_filtered['stress_level'].cat.codes.values, minlength=len(STRESS_LEVELS))
+    energy_counts = np.bincount(df_filtered['energy_level'].cat.codes.values, minlength=len(ENERGY_LEVELS))
+    
     # Key metrics
     col1, col2, col3, col4 = st.columns(4)
     
@@ -252,25 +460,18 @@ def analytics_page():
         st.metric("Total Check-ins", total_checkins)
     
     with col3:
-        stress_counts = df_filtered['stress_level'].value_counts()
-        high_stress = stress_counts.get('High', 0)
+        high_stress = stress_counts[STRESS_LEVELS.index('High')]
         stress_percentage = (high_stress / total_checkins) * 100
         st.metric("High Stress %", f"{stress_percentage:.1f}%")
     
     with col4:
-        energy_counts = df_filtered['energy_level'].value_counts()
-        high_energy = energy_counts.get('High', 0)
+        high_energy = energy_counts[ENERGY_LEVELS.index('High')]
         energy_percentage = (high_energy / total_checkins) * 100
         st.metric("High Energy %", f"{energy_percentage:.1f}%")
     
     # Mood trend chart
     st.subheader("Mood Trend Over Time")
-    fig_mood = px.line(df_filtered, x='timestamp', y='mood_score',
-                       title="Mood Score Trend", range_y=[0, 10])
-    fig_mood.add_hline(y=7, line_dash="dash", line_color="green", 
-                       annotation_text="Good Mood Threshold")
-    fig_mood.add_hline(y=4, line_dash="dash", line_color="red", 
-                       annotation_text="Low Mood Alert")
+    fig_mood = _mood_trend_fig(mood_records(df_filtered), show_thresholds=True)
     st.plotly_chart(fig_mood, use_container_width=True)
     
     # Stress and energy distribution
@@ -278,27 +479,18 @@ def analytics_page():
     
     with col1:
         st.subheader("Stress Level Distribution")
-        stress_counts = df_filtered['stress_level'].value_counts()
-        fig_stress = px.pie(values=stress_counts.values, names=stress_counts.index,
-                           title="Stress Levels")
+        fig_stress = _distribution_fig(tuple(zip(STRESS_LEVELS, stress_counts.tolist())), "Stress Levels")
         st.plotly_chart(fig_stress, use_container_width=True)
     
     with col2:
         st.subheader("Energy Level Distribution")
-        energy_counts = df_filtered['energy_level'].value_counts()
-        fig_energy = px.pie(values=energy_counts.values, names=energy_counts.index,
-                           title="Energy Levels")
+        fig_energy = _distribution_fig(tuple(zip(ENERGY_LEVELS, energy_counts.tolist())), "Energy Levels")
         st.plotly_chart(fig_energy, use_container_width=True)
     
     # Stress triggers
     if st.session_state.stress_triggers:
         st.subheader("Top Stress Triggers")
-        triggers_df = pd.DataFrame(list(st.session_state.stress_triggers.items()),
-                                  columns=['Trigger', 'Frequency'])
-        triggers_df = triggers_df.sort_values('Frequency', ascending=False).head(10)
-        
-        fig_triggers = px.bar(triggers_df, x='Frequency', y='Trigger', 
-                             orientation='h', title="Most Common Stress Triggers")
+        fig_triggers = _triggers_fig(tuple(st.session_state.stress_triggers.most_common(10)))
         st.plotly_chart(fig_triggers, use_container_width=True)
 
 def soundscapes_page():
@@ -353,8 +545,8 @@ def soundscapes_page():
     with col2:
         st.subheader("Personalized Recommendations")
         
-        if st.session_state.mood_history:
-            latest_mood = st.session_state.mood_history[-1]
+        if not st.session_state.mood_df.empty:
+            latest_mood = st.session_state.mood_df.iloc[-1]
             mood_score = latest_mood['mood_score']
             stress_level = latest_mood['stress_level']
             
@@ -387,10 +579,10 @@ def journal_page():
         st.subheader("Create New Journal Entry")
         
         # Suggested prompts based on recent mood
-        if st.session_state.mood_history:
-            latest_entry = st.session_state.mood_history[-1]
-            if 'wellness_suggestions' in latest_entry and 'journaling_prompt' in latest_entry['wellness_suggestions']:
-                st.info(f"💡 **Suggested Prompt**: {latest_entry['wellness_suggestions']['journaling_prompt']}")
+        if st.session_state.suggestion_history:
+            latest_suggestions = st.session_state.suggestion_history[-1]
+            if 'journaling_prompt' in latest_suggestions:
+                st.info(f"💡 **Suggested Prompt**: {latest_suggestions['journaling_prompt']}")
         
         journal_prompt = st.selectbox("Choose a prompt or write freely:", [
             "Free writing",
@@ -415,6 +607,9 @@ def journal_page():
                         'word_count': len(journal_entry.split())
                     }
                     st.session_state.wellness_log.append(entry)
+                    st.session_state.journal_lines.append(
+                        ndjson_line({**entry, 'type': 'journal', 'timestamp': entry['timestamp'].isoformat()})
+                    )
                     st.success("Journal entry saved!")
                     st.balloons()
                 else:
@@ -445,8 +640,15 @@ def journal_page():
             avg_words = total_words / total_entries if total_entries > 0 else 0
             st.metric("Avg Words/Entry", f"{avg_words:.0f}")
         
-        # Display entries
-        for i, entry in enumerate(reversed(st.session_state.wellness_log)):
+        # Display entries newest first, one page at a time
+        page_size = 20
+        page_count = (total_entries - 1) // page_size + 1
+        page = 1
+        if page_count > 1:
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1)
+        end = total_entries - (page - 1) * page_size
+        for i in range(end - 1, max(end - page_size, 0) - 1, -1):
+            entry = st.session_state.wellness_log[i]
             with st.expander(f"📝 {entry['timestamp'].strftime('%B %d, %Y at %I:%M %p')} - {entry['word_count']} words"):
                 if entry['prompt'] != "Free writing":
                     st.write(f"**Prompt**: {entry['prompt']}")
@@ -455,7 +657,8 @@ def journal_page():
                 col1, col2 = st.columns([3, 1])
                 with col2:
                     if st.button("🗑️ Delete", key=f"delete_{i}"):
-                        st.session_state.wellness_log.remove(entry)
+                        del st.session_state.wellness_log[i]
+                        del st.session_state.journal_lines[i]
                         st.rerun()
 
 def settings_page():
@@ -482,39 +685,38 @@ def settings_page():
     with tab2:
         st.subheader("Data Management")
         
-        st.write(f"**Total mood check-ins**: {len(st.session_state.mood_history)}")
+        st.write(f"**Total mood check-ins**: {len(st.session_state.mood_df)}")
         st.write(f"**Total journal entries**: {len(st.session_state.wellness_log)}")
         
         col1, col2 = st.columns(2)
         
         with col1:
-            if st.button("📥 Export Data"):
-                # Create export data
-                export_data = {
-                    'mood_history': st.session_state.mood_history,
-                    'wellness_log': st.session_state.wellness_log,
-                    'stress_triggers': st.session_state.stress_triggers
-                }
-                
-                # Convert datetime objects to strings for JSON serialization
-                for entry in export_data['mood_history']:
-                    entry['timestamp'] = entry['timestamp'].isoformat()
-                for entry in export_data['wellness_log']:
-                    entry['timestamp'] = entry['timestamp'].isoformat()
-                
+            # Records are already serialized, so export only joins the retained lines
+            export_lines = st.session_state.checkin_lines + st.session_state.journal_lines
+            if export_lines:
                 st.download_button(
-                    label="Download JSON",
-                    data=json.dumps(export_data, indent=2),
-                    file_name=f"serenedesk_data_{datetime.now().strftime('%Y%m%d')}.json",
-                    mime="application/json"
+                    label="📥 Export Data",
+                    data="".join(export_lines),
+                    file_name=f"serenedesk_data_{datetime.now().strftime('%Y%m%d')}.ndjson",
+                    mime="application/x-ndjson"
                 )
+            else:
+                st.info("Nothing to export yet.")
         
         with col2:
+            # Confirmation has to survive the rerun triggered by the first click
             if st.button("🗑️ Clear All Data", type="secondary"):
+                st.session_state.confirm_clear = True
+            if st.session_state.get('confirm_clear'):
+                st.warning("This permanently deletes all check-ins and journal entries.")
                 if st.button("⚠️ Confirm Delete", type="secondary"):
-                    st.session_state.mood_history = []
+                    st.session_state.mood_df = new_mood_df()
+                    st.session_state.suggestion_history = []
+                    st.session_state.checkin_lines = []
                     st.session_state.wellness_log = []
-                    st.session_state.stress_triggers = {}
+                    st.session_state.journal_lines = []
+                    st.session_state.stress_triggers = Counter()
+                    st.session_state.confirm_clear = False
                     st.success("All data cleared!")
                     st.rerun()
     
@@ -535,7 +737,8 @@ def settings_page():
         - Plotly for data visualization
         
         **Privacy Note:**
-        Your data is stored locally in your browser session and is not transmitted to external servers.
+        Your data is kept in memory for your current browser session only and is never written to disk on the server.
+        The text of each check-in is sent to OpenAI for analysis.
         """)
         
         st.markdown("---")
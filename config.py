@@ -11,10 +11,17 @@ AUDIO_FORMAT = "wav"
 
 WHISPER_MODEL = "base"
 
-GPT_MODEL = "gpt-3.5-turbo"
-MAX_TOKENS = 500
+GPT_MODEL = "gpt-4o-mini"
+MAX_TOKENS = 300
 TEMPERATURE = 0.7
 
+# "openai" or "local" (DistilBERT SST-2 classifier; needs transformers, optimum-intel optional)
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "openai")
+LOCAL_SENTIMENT_MODEL = "distilbert/distilbert-base-uncased-finetuned-sst-2-english"
+
+# Process-wide ceiling on in-flight analyses; lower it to throttle OpenAI usage
+MAX_ANALYSIS_WORKERS = int(os.getenv("MAX_ANALYSIS_WORKERS", "32"))
+
 MOOD_THRESHOLDS = {
     "very_low": 0, 
     "low": 3, 
@@ -23,6 +30,9 @@ MOOD_THRESHOLDS = {
     "excellent": 9
 }
 
+STRESS_LEVELS = ["Low", "Moderate", "High"]
+ENERGY_LEVELS = ["Low", "Medium", "High"]
+
 STRESS_KEYWORDS = [
     "stressed", "overwhelmed", "anxious", "worried", "pressure", 
     "deadline", "frustrated", "tired", "exhausted", "burned out",
@@ -1,5 +1,5 @@
-from .audio_processor import AudioProcessor
 from .sentiment_analyzer import SentimentAnalyzer
 from .wellness_generator import WellnessGenerator
 
-__all__ = ['AudioProcessor', 'SentimentAnalyzer', 'WellnessGenerator']
+# AudioProcessor is imported from utils.audio_processor only when audio recording is enabled
+__all__ = ['SentimentAnalyzer', 'WellnessGenerator']
@@ -1,42 +1,340 @@
 import openai
-from config import OPENAI_API_KEY, GPT_MODEL, MAX_TOKENS, TEMPERATURE
+from config import OPENAI_API_KEY, GPT_MODEL, MAX_TOKENS
 from config import STRESS_KEYWORDS, POSITIVE_KEYWORDS
+from config import SENTIMENT_BACKEND, LOCAL_SENTIMENT_MODEL
 import re
 import json
 
+# Kept byte-for-byte stable across requests so OpenAI's prompt prefix cache
+# can hit; only the check-in text varies, and it goes in the user message.
+# The cache needs a prefix of at least 1024 tokens, so keep SYSTEM_PROMPT above that.
+FEW_SHOT_EXAMPLES = [
+    {
+        "check_in": "Overwhelmed with emails and back-to-back meetings. Need a break.",
+        "analysis": {
+            "mood_score": 3,
+            "stress_level": "High",
+            "energy_level": "Low",
+            "emotional_indicators": ["overwhelmed", "drained"],
+            "stress_triggers": ["emails", "back-to-back meetings"]
+        }
+    },
+    {
+        "check_in": "Great morning! Accomplished a lot and feeling motivated.",
+        "analysis": {
+            "mood_score": 8,
+            "stress_level": "Low",
+            "energy_level": "High",
+            "emotional_indicators": ["accomplished", "motivated"],
+            "stress_triggers": []
+        }
+    },
+    {
+        "check_in": "I'm feeling productive today but worried about tomorrow's presentation.",
+        "analysis": {
+            "mood_score": 6,
+            "stress_level": "Moderate",
+            "energy_level": "Medium",
+            "emotional_indicators": ["productive", "worried"],
+            "stress_triggers": ["upcoming presentation"]
+        }
+    },
+    {
+        "check_in": "Tired from staying up late. Struggling to focus on important tasks.",
+        "analysis": {
+            "mood_score": 4,
+            "stress_level": "Moderate",
+            "energy_level": "Low",
+            "emotional_indicators": ["tired", "struggling"],
+            "stress_triggers": ["lack of sleep", "difficulty focusing"]
+        }
+    },
+    {
+        "check_in": "Had a calm, focused morning. Cleared my inbox and I'm ready for the afternoon.",
+        "analysis": {
+            "mood_score": 8,
+            "stress_level": "Low",
+            "energy_level": "Medium",
+            "emotional_indicators": ["calm", "focused", "prepared"],
+            "stress_triggers": []
+        }
+    },
+    {
+        "check_in": "My manager moved the deadline up by a week and I'm anxious I won't finish. Can't stop thinking about it.",
+        "analysis": {
+            "mood_score": 3,
+            "stress_level": "High",
+            "energy_level": "Medium",
+            "emotional_indicators": ["anxious", "preoccupied"],
+            "stress_triggers": ["moved-up deadline", "workload"]
+        }
+    },
+    {
+        "check_in": "Completely burned out. Third late night this week and I still have a pile of tickets waiting.",
+        "analysis": {
+            "mood_score": 1,
+            "stress_level": "High",
+            "energy_level": "Low",
+            "emotional_indicators": ["burned out", "exhausted", "hopeless"],
+            "stress_triggers": ["late nights", "ticket backlog"]
+        }
+    },
+    {
+        "check_in": "Just shipped the feature we've been working on for months! The team is celebrating.",
+        "analysis": {
+            "mood_score": 10,
+            "stress_level": "Low",
+            "energy_level": "High",
+            "emotional_indicators": ["proud", "excited", "accomplished"],
+            "stress_triggers": []
+        }
+    },
+    {
+        "check_in": "Frustrated that the build keeps breaking and nobody is owning the fix. Wasted two hours today.",
+        "analysis": {
+            "mood_score": 3,
+            "stress_level": "Moderate",
+            "energy_level": "Medium",
+            "emotional_indicators": ["frustrated", "annoyed"],
+            "stress_triggers": ["broken builds", "unclear ownership"]
+        }
+    },
+    {
+        "check_in": "Pretty average day. Some meetings, some coding. Nothing special either way.",
+        "analysis": {
+            "mood_score": 5,
+            "stress_level": "Low",
+            "energy_level": "Medium",
+            "emotional_indicators": ["neutral"],
+            "stress_triggers": []
+        }
+    },
+    {
+        "check_in": "Nervous about my performance review tomorrow, but grateful my teammates offered to help me prepare.",
+        "analysis": {
+            "mood_score": 6,
+            "stress_level": "Moderate",
+            "energy_level": "Medium",
+            "emotional_indicators": ["nervous", "grateful", "supported"],
+            "stress_triggers": ["performance review"]
+        }
+    },
+    {
+        "check_in": "The open office is so loud I can't concentrate, and the constant Slack pings keep pulling me out of deep work.",
+        "analysis": {
+            "mood_score": 4,
+            "stress_level": "Moderate",
+            "energy_level": "Medium",
+            "emotional_indicators": ["distracted", "irritated"],
+            "stress_triggers": ["office noise", "chat notifications"]
+        }
+    }
+]
+
+SYSTEM_PROMPT = "\n".join([
+    "You are a workplace wellness AI. Analyze the user's mood check-in and return JSON only.",
+    "",
+    "Respond with a single JSON object with exactly these keys:",
+    "- mood_score: integer from 0 (very low) to 10 (excellent)",
+    "- stress_level: one of \"Low\", \"Moderate\", \"High\"",
+    "- energy_level: one of \"Low\", \"Medium\", \"High\"",
+    "- emotional_indicators: list of short phrases describing the emotions expressed",
+    "- stress_triggers: list of short phrases naming workplace causes of stress (empty if none)",
+    "When given several numbered check-ins, return a JSON array of these objects, one per check-in, in order.",
+    "Do not add any text before or after the JSON.",
+    "",
+    "How to score mood_score:",
+    "- 0-2: in distress; burned out, hopeless, or unable to cope with the day",
+    "- 3-4: clearly struggling; stress or fatigue outweighs anything positive",
+    "- 5: neutral or evenly mixed; an ordinary day with nothing notable either way",
+    "- 6-7: generally good; some worries, but the overall tone is positive or hopeful",
+    "- 8-9: very good; calm, productive, motivated, or proud of recent work",
+    "- 10: exceptional; celebrating a major success with no signs of stress",
+    "Weigh how the person describes feeling now more heavily than events they mention in passing.",
+    "",
+    "How to choose stress_level:",
+    "- Low: no pressure described, or pressure the person says they are handling comfortably",
+    "- Moderate: one or two named sources of pressure, worry or frustration that are still manageable",
+    "- High: overwhelm, anxiety, burnout, or several stressors at once that the person feels unable to handle",
+    "",
+    "How to choose energy_level:",
+    "- Low: tired, exhausted, drained, sleepy, or struggling to focus because of fatigue",
+    "- Medium: no strong signal either way, or a mix of tiredness and motivation",
+    "- High: energized, motivated, excited, or describing a burst of productivity",
+    "",
+    "For emotional_indicators, use the person's own emotion words where possible, lowercase, at most five.",
+    "For stress_triggers, name concrete workplace causes (deadlines, meetings, workload, colleagues, tools, environment),",
+    "not emotions. Keep each trigger to a few words so the same cause is phrased the same way across check-ins.",
+    "Use an empty list when no cause is mentioned. Never invent triggers the person did not describe.",
+    "",
+    "Words that usually signal stress: " + json.dumps(STRESS_KEYWORDS),
+    "Words that usually signal a positive state: " + json.dumps(POSITIVE_KEYWORDS),
+    "",
+    "Examples:",
+    *[
+        f"Check-in: {example['check_in']}\nJSON: {json.dumps(example['analysis'])}"
+        for example in FEW_SHOT_EXAMPLES
+    ]
+])
+
+# Check-ins per batched request; the shared system prompt is only sent once per batch
+BATCH_SIZE = 8
+
+# One alternation per keyword list, compiled once so each check-in is scanned in a single pass
+def _keyword_pattern(keywords):
+    return re.compile("|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)))
+
+STRESS_PATTERN = _keyword_pattern(STRESS_KEYWORDS)
+POSITIVE_PATTERN = _keyword_pattern(POSITIVE_KEYWORDS)
+LOW_ENERGY_PATTERN = _keyword_pattern(["tired", "exhausted"])
+HIGH_ENERGY_PATTERN = _keyword_pattern(["energetic", "motivated"])
+
+def count_keywords(pattern, text):
+    return len(set(pattern.findall(text)))
+
 class SentimentAnalyzer:
     def __init__(self):
         openai.api_key = OPENAI_API_KEY
         self.client = openai.OpenAI(api_key=OPENAI_API_KEY)
+        self.local_classifier = None
+        if SENTIMENT_BACKEND == "local":
+            self.local_classifier = self._load_local_classifier()
     
-    def analyze_sentiment(self, transcript):
+    def _load_local_classifier(self):
         try:
-            prompt = f"Analyze this workplace mood check-in and respond in JSON format with mood_score (0-10), stress_level (Low/Moderate/High), energy_level (Low/Medium/High), emotional_indicators (list), stress_triggers (list): {transcript}"
-            
-            response = self.client.chat.completions.create(
-                model=GPT_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a workplace wellness AI. Analyze mood and return JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=MAX_TOKENS,
-                temperature=TEMPERATURE
+            from transformers import AutoTokenizer, pipeline
+        except ImportError:
+            print("transformers is not installed; using OpenAI for sentiment analysis")
+            return None
+        
+        # Prefer an INT8 OpenVINO export when optimum-intel is available
+        try:
+            from optimum.intel import OVModelForSequenceClassification
+            model = OVModelForSequenceClassification.from_pretrained(
+                LOCAL_SENTIMENT_MODEL, export=True, load_in_8bit=True
             )
+        except ImportError:
+            model = LOCAL_SENTIMENT_MODEL
+        except Exception as e:
+            print(f"OpenVINO export failed ({e}); using the plain transformers model")
+            model = LOCAL_SENTIMENT_MODEL
+        
+        # Hub/network or model errors must not crash startup; cache_resource would retry on every rerun
+        try:
+            tokenizer = AutoTokenizer.from_pretrained(LOCAL_SENTIMENT_MODEL)
+            return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+        except Exception as e:
+            print(f"Could not load {LOCAL_SENTIMENT_MODEL} ({e}); using OpenAI for sentiment analysis")
+            return None
+    
+    def stream_sentiment(self, transcript):
+        stream = self.client.chat.completions.create(
+            model=GPT_MODEL,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": f"Check-in: {transcript}"}
+            ],
+            max_tokens=MAX_TOKENS,
+            temperature=0,
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    def analyze_sentiment(self, transcript, on_token=None):
+        try:
+            if self.local_classifier is not None:
+                return self._local_analysis(transcript)
             
-            analysis_text = response.choices[0].message.content.strip()
-            json_match = re.search(r'\{.*\}', analysis_text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(0))
-            else:
-                return self._keyword_based_analysis(transcript)
+            tokens = []
+            for token in self.stream_sentiment(transcript):
+                tokens.append(token)
+                if on_token:
+                    on_token(token)
+            return self.parse_analysis("".join(tokens), transcript)
         except Exception as e:
             print(f"Error: {e}")
-            return self._keyword_based_analysis(transcript)
+            return self._fallback_analysis(transcript)
+    
+    def analyze_batch(self, transcripts):
+        if self.local_classifier is not None:
+            # analyze_sentiment wraps the classifier in the same keyword fallback as the API path
+            return [self.analyze_sentiment(transcript) for transcript in transcripts]
+        
+        # Group similar-length check-ins so one long entry doesn't stall a batch of short ones
+        order = sorted(range(len(transcripts)), key=lambda i: len(transcripts[i]))
+        results = [None] * len(transcripts)
+        for start in range(0, len(order), BATCH_SIZE):
+            batch = order[start:start + BATCH_SIZE]
+            for i, result in zip(batch, self._analyze_chunk([transcripts[i] for i in batch])):
+                results[i] = result
+        return results
+    
+    def _analyze_chunk(self, transcripts):
+        try:
+            analysis_text = self._request_chunk(transcripts)
+        except Exception as e:
+            print(f"Error: {e}")
+            return [self._fallback_analysis(transcript) for transcript in transcripts]
+        
+        # A malformed or wrong-length array can't be matched to inputs, so retry each check-in alone
+        analyses = self._parse_array(analysis_text)
+        if analyses is None or len(analyses) != len(transcripts):
+            return [self.analyze_sentiment(transcript) for transcript in transcripts]
+        return [
+            analysis if isinstance(analysis, dict) else self.analyze_sentiment(transcript)
+            for transcript, analysis in zip(transcripts, analyses)
+        ]
+    
+    def _request_chunk(self, transcripts):
+        numbered = "\n".join(f"[{i}] {transcript}" for i, transcript in enumerate(transcripts, 1))
+        response = self.client.chat.completions.create(
+            model=GPT_MODEL,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": f"Check-ins:\n{numbered}"}
+            ],
+            max_tokens=MAX_TOKENS * len(transcripts),
+            temperature=0
+        )
+        return response.choices[0].message.content.strip()
+    
+    def _parse_array(self, analysis_text):
+        json_match = re.search(r'\[.*\]', analysis_text, re.DOTALL)
+        if not json_match:
+            return None
+        try:
+            analyses = json.loads(json_match.group(0))
+        except ValueError:
+            return None
+        return analyses if isinstance(analyses, list) else None
+    
+    def parse_analysis(self, analysis_text, transcript):
+        json_match = re.search(r'\{.*\}', analysis_text.strip(), re.DOTALL)
+        if json_match:
+            return json.loads(json_match.group(0))
+        else:
+            return self._fallback_analysis(transcript)
+    
+    def _fallback_analysis(self, transcript):
+        # Flagged so callers can tell a degraded result from a real analysis and avoid caching it
+        result = self._keyword_based_analysis(transcript)
+        result['fallback'] = True
+        return result
+    
+    def _local_analysis(self, transcript):
+        # The classifier only scores polarity; stress and energy still come from keywords
+        result = self._keyword_based_analysis(transcript)
+        prediction = self.local_classifier(transcript, truncation=True)[0]
+        positive_prob = prediction['score'] if prediction['label'] == 'POSITIVE' else 1 - prediction['score']
+        result['mood_score'] = round(10 * positive_prob)
+        return result
     
     def _keyword_based_analysis(self, transcript):
         transcript_lower = transcript.lower()
-        stress_count = sum(1 for keyword in STRESS_KEYWORDS if keyword in transcript_lower)
-        positive_count = sum(1 for keyword in POSITIVE_KEYWORDS if keyword in transcript_lower)
+        stress_count = count_keywords(STRESS_PATTERN, transcript_lower)
+        positive_count = count_keywords(POSITIVE_PATTERN, transcript_lower)
         
         if positive_count > stress_count:
             mood_score = min(10, 6 + positive_count - stress_count)
@@ -52,9 +350,9 @@ class SentimentAnalyzer:
         else:
             stress_level = "Low"
         
-        if any(word in transcript_lower for word in ["tired", "exhausted"]):
+        if LOW_ENERGY_PATTERN.search(transcript_lower):
             energy_level = "Low"
-        elif any(word in transcript_lower for word in ["energetic", "motivated"]):
+        elif HIGH_ENERGY_PATTERN.search(transcript_lower):
             energy_level = "High"
         else:
             energy_level = "Medium"